@@ -1,11 +1,24 @@
 
 import os
+import io
+import base64
+import csv
 import json
-from collections import Counter
+import re
+from collections import defaultdict
 from datetime import datetime
-import statistics
-from arcgis.gis import GIS
-from arcgis.features import FeatureLayer
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, zip_longest
+from operator import itemgetter
+import anyio
+from cachetools import TTLCache, cached
+from cachetools.func import ttl_cache
+from cachetools.keys import hashkey
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+# arcgis (and the pandas/numpy stack it pulls in) is imported on first use inside
+# the helpers below, so starting the server only pays for FastMCP itself
 # from arcgis.map import Map
 from mcp.server.fastmcp import FastMCP
 from dotenv import load_dotenv
@@ -17,15 +30,109 @@ load_dotenv()
 ARCGIS_USERNAME = os.getenv("ARCGIS_USERNAME")
 ARCGIS_PASSWORD = os.getenv("ARCGIS_PASSWORD")
 
-# Authenticate with ArcGIS Online
-gis = GIS("https://www.arcgis.com", ARCGIS_USERNAME, ARCGIS_PASSWORD)
+# Keep connections alive across tool calls so each REST request reuses an
+# existing TCP+TLS connection instead of paying a fresh handshake.
+HTTP_POOL_SIZE = int(os.getenv("ARCGIS_POOL_SIZE", "32"))
+if HTTP_POOL_SIZE < 1:
+    raise ValueError(f"ARCGIS_POOL_SIZE must be at least 1, got {HTTP_POOL_SIZE}")
+
+# Transient gateway errors are retried with exponential backoff on the same pool.
+# The ArcGIS API sends layer queries and portal searches as POST, which urllib3
+# doesn't retry by default; every POST this server makes is a read-only query,
+# so retrying it is safe.
+HTTP_RETRY = Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504],
+                   allowed_methods=frozenset({"GET", "POST"}))
+
+# Authentication with ArcGIS Online is deferred to the first tool call so the
+# sign-in round-trip doesn't delay server startup
+_gis = None
+_gis_lock = threading.Lock()
+
+def get_gis():
+    """Returns the shared authenticated GIS, signing in on first use."""
+    global _gis
+    if _gis is None:
+        with _gis_lock:
+            if _gis is None:
+                from arcgis.gis import GIS
+                gis = GIS("https://www.arcgis.com", ARCGIS_USERNAME, ARCGIS_PASSWORD)
+                adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE,
+                                      max_retries=HTTP_RETRY)
+                gis._con._session.mount("https://", adapter)
+                gis._con._session.mount("http://", adapter)
+                _gis = gis
+    return _gis
+
+# Shared pool for fanning out independent REST calls. It gets half of HTTP_POOL_SIZE
+# (at most 16) and tool threads the rest, so together they don't hold more
+# connections than the pool keeps alive (a pool of 1 still gets one of each).
+FANOUT_WORKERS = max(1, min(16, HTTP_POOL_SIZE // 2))
+_executor = ThreadPoolExecutor(max_workers=FANOUT_WORKERS)
+
+# Cap on tool calls running their blocking work at once, so bursts of MCP
+# requests queue instead of spawning threads beyond what the pool can serve
+TOOL_THREAD_LIMIT = max(1, HTTP_POOL_SIZE - FANOUT_WORKERS)
+_thread_limiter = None
+
+async def _run_sync(func, *args):
+    """Runs a blocking tool helper on a worker thread under the shared capacity limiter."""
+    global _thread_limiter
+    if _thread_limiter is None:
+        # Created lazily so it binds to the running event loop
+        _thread_limiter = anyio.CapacityLimiter(TOOL_THREAD_LIMIT)
+    return await anyio.to_thread.run_sync(func, *args, limiter=_thread_limiter)
+
+# Tool results are memoized so repeated identical calls skip the ArcGIS Online
+# round-trip. Only successful results are cached; exceptions are never stored.
+CACHE_MAXSIZE = 256
+CACHE_TTL = int(os.getenv("ARCGIS_CACHE_TTL", "600"))  # seconds
+
+def _keyword_cache(normalize):
+    """Like ttl_cache, but keys on normalize(keyword), the first argument.
+
+    Portal matching is case-insensitive, so "Hydrants" and "hydrants" can share an entry. The
+    keyword itself is always passed through unchanged.
+    """
+    def decorate(func):
+        return cached(TTLCache(maxsize=CACHE_MAXSIZE, ttl=CACHE_TTL),
+                      key=lambda keyword, *args, **kwargs: hashkey(normalize(keyword), *args, **kwargs),
+                      lock=threading.RLock())(func)
+    return decorate
+
+# Search operators the portal only recognizes in upper case
+_QUERY_OPERATORS = frozenset({"AND", "OR", "NOT", "TO"})
+
+def _query_key(query: str) -> str:
+    """Lower-cases a portal search query for caching, except its upper-case operators.
+
+    "roads or highways" searches for the word "or" while "roads OR highways" is a boolean
+    query, so the two must not share a cache entry.
+    """
+    return re.sub(r"\S+", lambda term: term[0] if term[0] in _QUERY_OPERATORS else term[0].lower(), query)
+
+# Upper bound on features requested per query page
+PAGE_SIZE = 2000
+
+# Item types searched in parallel when search_content is called without an item_type
+_COMMON_CONTENT_TYPES = ("Feature Service", "Web Map", "Dashboard", "StoryMap", "Web Mapping Application", "Map Service")
+
+# Field types that have no meaningful CSV representation
+_NON_TABULAR_TYPES = frozenset({"esriFieldTypeGeometry", "esriFieldTypeBlob", "esriFieldTypeRaster"})
+
+# Field types summarized with numeric and date statistics
+_NUMERIC_TYPES = frozenset({
+    "esriFieldTypeDouble", "esriFieldTypeSingle",
+    "esriFieldTypeInteger", "esriFieldTypeSmallInteger", "esriFieldTypeBigInteger",
+})
+_DATE_TYPES = frozenset({"esriFieldTypeDate", "esriFieldTypeTimestampOffset"})
 
 @mcp.tool()
-def search_layers(keyword: str) -> str:
+async def search_layers(keyword: str, limit: int = 20) -> str:
     """Searches ArcGIS Online for layers and sublayers matching a keyword and returns their REST URLs.
     
     Args:
         keyword: The keyword or description to search for (e.g., 'Hydrants').
+        limit: Maximum number of items to search and resolve layers for (default 20).
     
     Returns:
         A list of matching layer names and their REST URLs as a string.
@@ -35,63 +142,257 @@ def search_layers(keyword: str) -> str:
         get_feature_table to preview data or summarize_field to analyze specific fields.
     """
     try:
-        matches = []
-
-        # IMPORTANT: item_type must be a *string*
-        items = gis.content.search(
-            query=keyword,
-            item_type="Feature Layer",
-            max_items=20
-        )
-
-        for item in items:
-            # Feature Layer collections often contain multiple layers
-            if getattr(item, "layers", None):
-                for lyr in item.layers:
-                    name = lyr.properties.name
-                    if keyword.lower() in name.lower():
-                        matches.append(f"{name}: {lyr.url}")
-            # Single-layer items fall through here
-            elif item.url and keyword.lower() in (item.title or "").lower():
-                matches.append(f"{item.title}: {item.url}")
-
-        return "\n".join(matches) if matches else "No matching layers found."
+        return await _run_sync(_search_layers, keyword, limit)
     except Exception as exc:
         return f"Error searching layers: {exc}"
 
+# The keyword is quoted into the query, so operators in it are plain words
+@_keyword_cache(str.lower)
+def _search_layers(keyword: str, limit: int = 20) -> str:
+    matches = []
+
+    # Scope the match to indexed title/tag fields so the portal discards unrelated
+    # items before we pay for their layer metadata. Grouped, since search() appends
+    # the item_type clause to the end of the query.
+    term = keyword.replace('"', "")
+    query = f'(title:"{term}" OR tags:"{term}" OR typekeywords:"{term}")'
+
+    # IMPORTANT: item_type must be a *string*
+    items = get_gis().content.search(
+        query=query,
+        item_type="Feature Layer",
+        max_items=limit
+    )
+
+    # One descriptor request per item; fan them out over the shared pool
+    layer_lists = list(_executor.map(_service_layers, [item.url for item in items]))
+
+    kw = keyword.lower()
+    for item, item_layers in zip(items, layer_lists):
+        # Feature Layer collections often contain multiple layers
+        if item_layers:
+            for name, url in item_layers:
+                if kw in name.lower():
+                    matches.append(f"{name}: {url}")
+            continue
+        # Single-layer items fall through here
+        url, title = item.url, item.title
+        if url and kw in (title or "").lower():
+            matches.append(f"{title}: {url}")
+
+    return "\n".join(matches) if matches else "No matching layers found."
+
+@ttl_cache(maxsize=CACHE_MAXSIZE, ttl=CACHE_TTL)
+def _service_layers(service_url: str):
+    """Returns (name, url) pairs for the layers of a Feature Service item's URL.
+
+    Reads the service descriptor (?f=json) directly, which lists every layer's id and name
+    in one request, rather than building a FeatureLayer per sublayer through item.layers
+    and fetching each one's properties. Cached, since the same services recur across
+    different keyword searches.
+    """
+    if not service_url:
+        return ()
+    service = get_gis()._con.get(service_url, {"f": "json"})
+    base = service_url.rstrip("/")
+    return tuple((lyr["name"], f"{base}/{lyr['id']}") for lyr in service.get("layers") or [])
+
+@ttl_cache(maxsize=128, ttl=CACHE_TTL)
+def _layer_meta(service_url: str):
+    """Returns (flayer, fields_by_lower_name, table_fields) for a layer URL.
+
+    The layer descriptor is fetched once and reused by every tool until the TTL expires,
+    so schema changes are picked up after at most CACHE_TTL seconds.
+    """
+    from arcgis.features import FeatureLayer
+    flayer = FeatureLayer(service_url, gis=get_gis())
+    fields_by_lower = {f.name.lower(): f for f in flayer.properties.fields}
+    # Only fields that render as CSV text; geometry/blob/raster columns bloat the payload
+    table_fields = tuple(f.name for f in flayer.properties.fields if f.type not in _NON_TABULAR_TYPES)
+    return flayer, fields_by_lower, table_fields
+
+def _iter_features(flayer, out_fields="*", where="1=1", max_rows=None):
+    """Yields features page by page so results are never silently truncated at the server's maxRecordCount.
+
+    Uses resultOffset/resultRecordCount paging when the layer supports it, falls back to
+    OBJECTID-range WHERE clauses when it only supports statistics, and otherwise issues a
+    single query. Stops after max_rows features (None means all).
+    """
+    props = flayer.properties
+    advanced = props.get("advancedQueryCapabilities") or {}
+    page_size = min(PAGE_SIZE, props.get("maxRecordCount") or PAGE_SIZE)
+    remaining = max_rows
+
+    def take(features):
+        nonlocal remaining
+        if remaining is not None:
+            features = features[:remaining]
+            remaining -= len(features)
+        return features
+
+    if advanced.get("supportsPagination"):
+        offset = 0
+        while remaining is None or remaining > 0:
+            count = page_size if remaining is None else min(page_size, remaining)
+            page = flayer.query(where=where, out_fields=out_fields, return_geometry=False,
+                                result_offset=offset, result_record_count=count)
+            yield from take(page.features)
+            if len(page.features) < count:
+                return
+            offset += len(page.features)
+        return
+
+    oid_field = props.get("objectIdField")
+    if oid_field and _supports_statistics(flayer):
+        stats = _query_stats(flayer, [_stat("min", oid_field), _stat("max", oid_field)], where=where)
+        if not stats:
+            return
+        low, high = stats[0].get("min_value"), stats[0].get("max_value")
+        if low is None or high is None:
+            return
+        while low <= high and (remaining is None or remaining > 0):
+            # Full-page windows: OBJECTID gaps and selective WHERE clauses leave many windows
+            # sparse, and an over-fetch is bounded at one page and trimmed by take()
+            chunk_where = f"({where}) AND {oid_field} BETWEEN {low} AND {low + page_size - 1}"
+            page = flayer.query(where=chunk_where, out_fields=out_fields, return_geometry=False)
+            yield from take(page.features)
+            low += page_size
+        return
+
+    # No paging support: a single request is the best we can do
+    page = flayer.query(where=where, out_fields=out_fields, return_geometry=False,
+                        result_record_count=max_rows)
+    yield from take(page.features)
+
 @mcp.tool()
-def get_feature_table(service_url: str) -> str:
+async def get_feature_table(service_url: str, max_rows: int = 20, output_format: str = "csv", spread: bool = False) -> str:
     """Fetches a sample of the attribute table from an ArcGIS Online hosted feature layer using the REST service URL.
-    
+
     Args:
         service_url: The REST service URL of the feature layer (obtained from search_layers).
-    
+        max_rows: Maximum number of rows to return (default 20). Larger tables are fetched page by page.
+        output_format: "csv" (default) or "parquet". Parquet is zstd-compressed and returned
+            base64-encoded, which is far smaller than CSV for large max_rows.
+        spread: If True, sample rows spread evenly across the whole table instead of the
+            first max_rows, which is usually more representative of the data.
+
     Returns:
-        The first 20 rows of the attribute table as a string (CSV format) for LLM analysis. 
-        Note: This is a sample, not the complete table.
-    
+        Up to max_rows rows of the attribute table as a string (CSV format, or base64 Parquet)
+        for LLM analysis. Note: This is a sample, not the complete table.
+
     Workflow:
-        Use after search_layers to preview data structure and identify field names. 
+        Use after search_layers to preview data structure and identify field names.
         Then use summarize_field for detailed analysis of specific fields.
     """
     try:
-        flayer = FeatureLayer(service_url, gis=gis)
-        features = flayer.query(where="1=1", out_fields="*", return_geometry=False, result_record_count=20)
-        if not features.features:
-            return "No features found."
-        # Convert to CSV string
-        fields = [f.name for f in flayer.properties.fields]
-        rows = [fields]
-        for feat in features:
-            row = [str(feat.attributes.get(f, "")) for f in fields]
-            rows.append(row)
-        csv_str = "\n".join([",".join(row) for row in rows])
-        return csv_str
+        return await _run_sync(_get_feature_table, service_url, max_rows, output_format, spread)
     except Exception as e:
         return f"Error fetching table: {e}"
 
+@ttl_cache(maxsize=CACHE_MAXSIZE, ttl=CACHE_TTL)
+def _get_feature_table(service_url: str, max_rows: int = 20, output_format: str = "csv", spread: bool = False) -> str:
+    encode = _TABLE_ENCODERS.get(output_format)
+    if encode is None:
+        raise ValueError(f"Unsupported output_format '{output_format}'; use one of: {', '.join(_TABLE_ENCODERS)}.")
+    if max_rows < 1:
+        raise ValueError("max_rows must be at least 1.")
+    flayer, _, fields = _layer_meta(service_url)
+    out_fields = ",".join(fields)
+    if spread:
+        features = _spread_features(flayer, out_fields, max_rows)
+    else:
+        features = _iter_features(flayer, out_fields=out_fields, max_rows=max_rows)
+    first = next(features, None)
+    if first is None:
+        return "No features found."
+    return encode(fields, chain([first], features))
+
+def _spread_features(flayer, out_fields: str, max_rows: int):
+    """Yields about max_rows features spread evenly over the OBJECTID range.
+
+    With pagination, every k-th OBJECTID is selected with MOD() and read like the first rows,
+    so the sample costs one count query and the same payload. Without it, the OBJECTID-range
+    pager would walk the whole table to find those rows, so evenly stepped OBJECTIDs are
+    computed from the min/max statistics and fetched with IN lists instead. OBJECTID gaps can
+    leave either sample a little short. Falls back to the first max_rows when sampling isn't
+    needed or possible.
+    """
+    props = flayer.properties
+    oid_field = props.get("objectIdField")
+    advanced = props.get("advancedQueryCapabilities") or {}
+
+    if oid_field and advanced.get("supportsPagination"):
+        step = flayer.query(where="1=1", return_count_only=True) // max_rows
+        if step > 1:
+            yield from _iter_features(flayer, out_fields=out_fields, where=f"MOD({oid_field}, {step}) = 0",
+                                      max_rows=max_rows)
+            return
+
+    elif oid_field and _supports_statistics(flayer):
+        stats = _query_stats(flayer, [_stat("min", oid_field), _stat("max", oid_field)])
+        low, high = (stats[0].get("min_value"), stats[0].get("max_value")) if stats else (None, None)
+        if low is None or high is None:
+            return
+        low, high = int(low), int(high)
+        step = (high - low + 1) // max_rows
+        if step > 1:
+            oids = range(low, high + 1, step)[:max_rows]
+            page_size = min(PAGE_SIZE, props.get("maxRecordCount") or PAGE_SIZE)
+            for i in range(0, len(oids), page_size):
+                in_list = ",".join(map(str, oids[i:i + page_size]))
+                page = flayer.query(where=f"{oid_field} IN ({in_list})", out_fields=out_fields,
+                                    return_geometry=False)
+                yield from page.features
+            return
+
+    yield from _iter_features(flayer, out_fields=out_fields, max_rows=max_rows)
+
+def _to_csv(fields, features) -> str:
+    """Encodes feature attributes as CSV text with a header row."""
+    # csv.writer handles quoting of commas, quotes and newlines in attribute values
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(fields)
+    row = _row_getter(fields)
+    writer.writerows(row(feat.attributes) for feat in features)
+    return buf.getvalue()
+
+def _row_getter(fields):
+    """Returns a function that pulls the given fields out of an attributes dict as a tuple.
+
+    itemgetter does the lookups in a single C call per row. The server returns every
+    requested field, so a KeyError is rare; it falls back to "" for the missing keys.
+    """
+    if not fields:
+        return lambda attrs: ()
+    getter = itemgetter(*fields)
+    if len(fields) == 1:
+        single = getter
+        getter = lambda attrs: (single(attrs),)
+
+    def row(attrs):
+        try:
+            return getter(attrs)
+        except KeyError:
+            return getter(defaultdict(str, attrs))
+    return row
+
+def _to_parquet_b64(fields, features) -> str:
+    """Encodes feature attributes as a zstd-compressed Parquet table, base64-encoded for transport."""
+    import pandas as pd
+    df = pd.DataFrame.from_records((feat.attributes for feat in features), columns=list(fields))
+    buf = io.BytesIO()
+    df.to_parquet(buf, engine="pyarrow", compression="zstd", index=False)
+    return base64.b64encode(buf.getvalue()).decode("ascii")
+
+# get_feature_table output formats; add an entry here to support a new one
+_TABLE_ENCODERS = {
+    "csv": _to_csv,
+    "parquet": _to_parquet_b64,
+}
+
 @mcp.tool()
-def summarize_field(service_url: str, field_name: str) -> str:
+async def summarize_field(service_url: str, field_name: str) -> str:
     """Provides summary statistics for a specific field in an ArcGIS feature layer.
     
     Args:
@@ -107,106 +408,376 @@ def summarize_field(service_url: str, field_name: str) -> str:
         For text/date fields: returns unique values, top 10 frequencies, date ranges.
     """
     try:
-        flayer = FeatureLayer(service_url, gis=gis)
-        
-        # Get field metadata to determine type
-        field_info = None
-        for field in flayer.properties.fields:
-            if field.name.lower() == field_name.lower():
-                field_info = field
-                field_name = field.name  # Use exact case
-                break
-        
-        if not field_info:
-            return f"Field '{field_name}' not found in the feature layer."
-        
-        # Query for field values
-        features = flayer.query(where="1=1", out_fields=field_name, return_geometry=False)
-        
-        if not features.features:
+        return await _run_sync(_summarize_field, service_url, field_name)
+    except Exception as e:
+        return f"Error summarizing field: {e}"
+
+def _summarize_field(service_url: str, field_name: str) -> str:
+    flayer, fields_by_lower, _ = _layer_meta(service_url)
+
+    # Get field metadata to determine type
+    field_info = fields_by_lower.get(field_name.lower())
+    if not field_info:
+        return f"Field '{field_name}' not found in the feature layer."
+    field_name = field_info.name  # Use exact case
+
+    # Let the server aggregate, which returns a handful of rows instead of every feature's value
+    if field_info.type not in _NON_TABULAR_TYPES and _supports_statistics(flayer):
+        try:
+            return _summarize_on_server(flayer, field_name, field_info.type)
+        except Exception:
+            pass  # Statistics query rejected or incomplete; summarize client-side instead
+
+    return _summarize_by_scan(flayer, field_name, field_info.type)
+
+def _summarize_by_scan(flayer, field_name: str, field_type: str) -> str:
+    """Summarizes a field client-side by streaming its values, for services that can't aggregate."""
+    # Only the client-side scan needs these
+    from collections import Counter
+    import numpy as np
+
+    # Stream the values page by page (no maxRecordCount truncation) and keep only
+    # per-value counts, so memory grows with distinct values rather than features
+    value_counts = Counter(feat.attributes.get(field_name)
+                           for feat in _iter_features(flayer, out_fields=field_name))
+    null_count = value_counts.pop(None, 0)
+    non_null_count = sum(value_counts.values())
+
+    # Basic statistics for all types
+    total_count = non_null_count + null_count
+    if not total_count:
+        return "No features found in the layer."
+    summary = _summary_header(field_name, field_type, total_count, null_count)
+
+    if not non_null_count:
+        return "\n".join(summary) + "\nAll values are null."
+
+    # Type-specific statistics
+    if field_type in _NUMERIC_TYPES:
+        # Numeric field statistics, weighted by count over the distinct values
+        try:
+            distinct = np.fromiter(value_counts.keys(), dtype=np.float64, count=len(value_counts))
+        except (ValueError, TypeError):
+            distinct = None
+        if distinct is not None and distinct.size:
+            counts = np.fromiter(value_counts.values(), dtype=np.float64, count=len(value_counts))
+            mean = (distinct * counts).sum() / non_null_count
+            summary.append(f"Min: {_format_number(distinct.min())}")
+            summary.append(f"Max: {_format_number(distinct.max())}")
+            summary.append(f"Mean: {mean:.2f}")
+            summary.append(f"Median: {_format_number(_frequency_median(zip(distinct.tolist(), counts.tolist())))}")
+            if non_null_count >= 2:
+                variance = (((distinct - mean) ** 2) * counts).sum() / (non_null_count - 1)
+                summary.append(f"Std Dev: {np.sqrt(variance):.2f}")
+            summary.append(f"Mode: {_format_number(distinct[counts.argmax()])}")
+
+    elif field_type in _DATE_TYPES:
+        # Date field statistics: min/max over an int64 buffer of epoch milliseconds,
+        # converting only the two extremes to datetimes
+        millis = np.fromiter((v for v in value_counts if isinstance(v, (int, float))), dtype=np.int64)
+        if millis.size:
+            summary.extend(_date_range_lines(int(millis.min()), int(millis.max())))
+
+    # For all types, show unique values and top frequencies
+    summary.extend(_top_values_lines(len(value_counts), value_counts.most_common(10), non_null_count))
+
+    return "\n".join(summary)
+
+def _summary_header(field_name: str, field_type: str, total_count: int, null_count: int):
+    """Returns the opening summary lines shared by every field type, as a list to append to."""
+    null_percentage = null_count / total_count * 100
+    return [
+        f"Field: {field_name}",
+        f"Type: {field_type}",
+        f"Total features: {total_count}",
+        f"Null values: {null_count} ({null_percentage:.1f}%)",
+    ]
+
+def _format_number(value) -> str:
+    """Formats a numeric statistic the same way on the server and scan paths (3, not 3.0)."""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+def _top_values_lines(unique_count: int, top_values, non_null_count: int):
+    """Formats the unique-value count and the (value, count) frequency table."""
+    lines = [f"Unique values: {unique_count}"]
+    if top_values:
+        lines.append("\nTop 10 values:")
+        lines.extend(f"  '{value}': {count} ({count / non_null_count * 100:.1f}%)" for value, count in top_values)
+    return lines
+
+def _date_range_lines(earliest_ms, latest_ms):
+    """Formats the Earliest/Latest/Date range summary lines from epoch-millisecond extremes."""
+    # ArcGIS dates are milliseconds since epoch
+    try:
+        earliest = datetime.fromtimestamp(earliest_ms / 1000)
+        latest = datetime.fromtimestamp(latest_ms / 1000)
+    except (OverflowError, OSError, ValueError):
+        return []  # Out-of-range timestamps can't be shown as dates
+    return [
+        f"Earliest: {earliest.strftime('%Y-%m-%d')}",
+        f"Latest: {latest.strftime('%Y-%m-%d')}",
+        f"Date range: {(latest - earliest).days} days",
+    ]
+
+def _supports_statistics(flayer) -> bool:
+    """Returns True if the layer accepts outStatistics queries."""
+    props = flayer.properties
+    advanced = props.get("advancedQueryCapabilities") or {}
+    return bool(props.get("supportsStatistics") or advanced.get("supportsStatistics"))
+
+def _supports_percentiles(flayer) -> bool:
+    """Returns True if the layer accepts percentile_cont/percentile_disc statistics."""
+    advanced = flayer.properties.get("advancedQueryCapabilities") or {}
+    return bool(advanced.get("supportsPercentileStatistics"))
+
+def _stat(statistic_type: str, field_name: str, out_name: str = None) -> dict:
+    """Builds an outStatistics definition whose output field is named after the statistic.
+
+    percentile_cont is only used for medians, so it always asks for the 0.5 percentile.
+    """
+    stat = {"statisticType": statistic_type, "onStatisticField": field_name,
+            "outStatisticFieldName": out_name or f"{statistic_type}_value"}
+    if statistic_type == "percentile_cont":
+        stat["statisticParameters"] = {"value": 0.5}
+    return stat
+
+def _query_stats(flayer, out_statistics, where="1=1", **kwargs):
+    """Runs an outStatistics query and returns its rows as attribute dicts with lower-cased keys."""
+    result = flayer.query(where=where, return_geometry=False, out_statistics=out_statistics, **kwargs)
+    return [{k.lower(): v for k, v in feat.attributes.items()} for feat in result.features]
+
+def _frequency_median(frequencies):
+    """Computes the median from (value, count) pairs without expanding them into a list of values."""
+    ordered = sorted(frequencies)
+    total = sum(count for _, count in ordered)
+    # 0-based positions of the middle element(s), as in statistics.median
+    lower, upper = (total - 1) // 2, total // 2
+    seen = 0
+    low_value = None
+    for value, count in ordered:
+        seen += count
+        if low_value is None and seen > lower:
+            low_value = value
+        if seen > upper:
+            return value if value == low_value else (low_value + value) / 2
+
+def _stat_types(flayer, field_type: str):
+    """Returns the outStatistics types worth requesting for a field type on this layer."""
+    if field_type in _NUMERIC_TYPES:
+        if _supports_percentiles(flayer):
+            return ("count", "min", "max", "avg", "stddev", "percentile_cont")
+        return ("count", "min", "max", "avg", "stddev")
+    if field_type in _DATE_TYPES:
+        return ("count", "min", "max")
+    return ("count",)
+
+def _batched_stats(flayer, fields):
+    """Fetches the statistics for several fields in a single outStatistics query.
+
+    Returns one dict per field with the same keys _query_stats gives for a single field
+    ("count_value", "min_value", ...).
+    """
+    definitions = [
+        _stat(t, field.name, f"{t}_value_{i}")
+        for i, field in enumerate(fields)
+        for t in _stat_types(flayer, field.type)
+    ]
+    row = _query_stats(flayer, definitions)[0]
+    return [{f"{t}_value": row.get(f"{t}_value_{i}") for t in _stat_types(flayer, field.type)}
+            for i, field in enumerate(fields)]
+
+def _value_counts(flayer, field_name: str, limit: int = None):
+    """Returns (value, count) pairs for a field, most frequent first, from a grouped count query.
+
+    With limit, only the top rows are requested (ordered and paged by the server). Without it
+    the whole frequency table is fetched; the caller checks it against the non-null count to
+    detect server-side truncation.
+    """
+    kwargs = {}
+    if limit is not None:
+        kwargs = {"order_by_fields": "count_value DESC", "result_record_count": limit}
+    rows = _query_stats(flayer, [_stat("count", field_name)], where=f"{field_name} IS NOT NULL",
+                        group_by_fields_for_statistics=field_name, **kwargs)
+    key = field_name.lower()
+    counts = sorted(((row[key], row["count_value"]) for row in rows), key=lambda pair: pair[1], reverse=True)
+    return counts if limit is None else counts[:limit]
+
+def _distinct_count(flayer, field_name: str) -> int:
+    """Returns the number of distinct non-null values of a field."""
+    return flayer.query(where=f"{field_name} IS NOT NULL", out_fields=field_name,
+                        return_distinct_values=True, return_count_only=True)
+
+def _supports_top_values(flayer) -> bool:
+    """Returns True if the layer can return just the top N groups plus a distinct-value count."""
+    advanced = flayer.properties.get("advancedQueryCapabilities") or {}
+    return bool(advanced.get("supportsPaginationOnAggregatedQueries") and advanced.get("supportsOrderBy")
+                and advanced.get("supportsCountDistinct"))
+
+def _summarize_on_server(flayer, field_name: str, field_type: str, stats=None, total_count=None) -> str:
+    """Summarizes a field using server-side statistics queries instead of downloading its values.
+
+    Counts come from outStatistics/returnCountOnly queries, numeric and date extremes from
+    min/max/avg/stddev statistics, numeric medians from percentile_cont, and top values from a
+    grouped count. When the service supports it only the top 10 groups and a distinct count are
+    requested. Otherwise the full frequency table is fetched (numeric medians are then computed
+    from it). If the server truncated that table, numeric summaries drop the median and re-query
+    the top 10 groups when they can; otherwise ValueError is raised so the caller can fall back
+    to a client-side scan.
+
+    stats and total_count may be passed in from a batched query (see _batched_stats), in which
+    case only the grouped queries are issued here.
+    """
+    return _start_server_summary(flayer, field_name, field_type, stats, total_count)()
+
+def _start_server_summary(flayer, field_name: str, field_type: str, batched_stats=None, layer_count=None):
+    """Submits the queries behind _summarize_on_server and returns a function that waits for them.
+
+    Calling the returned function formats the summary, raising as _summarize_on_server does.
+    Keeping the two steps apart lets _summarize_fields overlap the queries of several fields
+    from its own thread instead of nesting work on _executor.
+    """
+    is_numeric = field_type in _NUMERIC_TYPES
+    is_date = field_type in _DATE_TYPES
+    # Numeric fields need the full frequency table unless the server can compute the median
+    top_n_only = _supports_top_values(flayer) and (not is_numeric or _supports_percentiles(flayer))
+
+    # The statistics, null-count and grouped queries are independent; overlap their round-trips
+    if batched_stats is None:
+        stats_future = _executor.submit(_query_stats, flayer, [_stat(t, field_name) for t in _stat_types(flayer, field_type)])
+        nulls_future = _executor.submit(flayer.query, where=f"{field_name} IS NULL", return_count_only=True)
+    counts_future = _executor.submit(_value_counts, flayer, field_name, 10 if top_n_only else None)
+    distinct_future = _executor.submit(_distinct_count, flayer, field_name) if top_n_only else None
+
+    def finish():
+        stats = batched_stats if batched_stats is not None else stats_future.result()[0]
+        non_null_count = stats.get("count_value") or 0
+        if batched_stats is None:
+            null_count = nulls_future.result()
+            total_count = non_null_count + null_count
+        else:
+            total_count = layer_count
+            null_count = total_count - non_null_count
+
+        if not total_count:
             return "No features found in the layer."
-        
-        # Extract values
-        values = [f.attributes.get(field_name) for f in features.features]
-        non_null_values = [v for v in values if v is not None]
-        
-        # Basic statistics for all types
-        total_count = len(values)
-        null_count = len(values) - len(non_null_values)
-        null_percentage = (null_count / total_count * 100) if total_count > 0 else 0
-        
-        summary = []
-        summary.append(f"Field: {field_name}")
-        summary.append(f"Type: {field_info.type}")
-        summary.append(f"Total features: {total_count}")
-        summary.append(f"Null values: {null_count} ({null_percentage:.1f}%)")
-        
-        if not non_null_values:
+
+        summary = _summary_header(field_name, field_type, total_count, null_count)
+
+        if not non_null_count:
             return "\n".join(summary) + "\nAll values are null."
-        
-        # Type-specific statistics
-        if field_info.type in ["esriFieldTypeDouble", "esriFieldTypeInteger", "esriFieldTypeSingle", "esriFieldTypeSmallInteger"]:
-            # Numeric field statistics
-            try:
-                numeric_values = [float(v) for v in non_null_values if v is not None]
-                if numeric_values:
-                    summary.append(f"Min: {min(numeric_values)}")
-                    summary.append(f"Max: {max(numeric_values)}")
-                    summary.append(f"Mean: {statistics.mean(numeric_values):.2f}")
-                    summary.append(f"Median: {statistics.median(numeric_values)}")
-                    if len(numeric_values) >= 2:
-                        summary.append(f"Std Dev: {statistics.stdev(numeric_values):.2f}")
-                    # Mode (if exists)
-                    try:
-                        mode_val = statistics.mode(numeric_values)
-                        summary.append(f"Mode: {mode_val}")
-                    except statistics.StatisticsError:
-                        pass  # No unique mode
-            except (ValueError, TypeError):
-                pass
-                
-        elif field_info.type == "esriFieldTypeDate":
-            # Date field statistics
-            date_values = []
-            for v in non_null_values:
-                if isinstance(v, (int, float)):
-                    # ArcGIS dates are often milliseconds since epoch
-                    try:
-                        date_values.append(datetime.fromtimestamp(v/1000))
-                    except:
-                        pass
-            
-            if date_values:
-                earliest = min(date_values)
-                latest = max(date_values)
-                summary.append(f"Earliest: {earliest.strftime('%Y-%m-%d')}")
-                summary.append(f"Latest: {latest.strftime('%Y-%m-%d')}")
-                summary.append(f"Date range: {(latest - earliest).days} days")
-        
-        # For all types, show unique values and top frequencies
-        value_counts = Counter(non_null_values)
-        unique_count = len(value_counts)
-        summary.append(f"Unique values: {unique_count}")
-        
-        # Top 10 most common values
-        if unique_count > 0:
-            summary.append("\nTop 10 values:")
-            for value, count in value_counts.most_common(10):
-                percentage = (count / len(non_null_values) * 100)
-                summary.append(f"  '{value}': {count} ({percentage:.1f}%)")
-        
+
+        frequencies = None
+        if top_n_only:
+            top_values = counts_future.result()
+            unique_count = distinct_future.result()
+        else:
+            frequencies = counts_future.result()
+            if sum(count for _, count in frequencies) == non_null_count:
+                top_values = frequencies[:10]
+                unique_count = len(frequencies)
+            elif is_numeric and _supports_top_values(flayer):
+                # Too many distinct values for an exact median without percentile statistics;
+                # keep the server aggregates and leave the median out rather than re-scanning
+                frequencies = None
+                unique_future = _executor.submit(_distinct_count, flayer, field_name)
+                top_values = _value_counts(flayer, field_name, 10)
+                unique_count = unique_future.result()
+            else:
+                raise ValueError("Grouped statistics were truncated by the server.")
+
+        if is_numeric:
+            median = stats.get("percentile_cont_value")
+            if median is None and frequencies is not None:
+                median = _frequency_median(frequencies)
+            summary.append(f"Min: {_format_number(stats['min_value'])}")
+            summary.append(f"Max: {_format_number(stats['max_value'])}")
+            summary.append(f"Mean: {stats['avg_value']:.2f}")
+            if median is not None:
+                summary.append(f"Median: {_format_number(median)}")
+            if non_null_count >= 2 and stats.get("stddev_value") is not None:
+                summary.append(f"Std Dev: {stats['stddev_value']:.2f}")
+            summary.append(f"Mode: {_format_number(top_values[0][0])}")
+        elif is_date and isinstance(stats.get("min_value"), (int, float)):
+            summary.extend(_date_range_lines(stats["min_value"], stats["max_value"]))
+
+        summary.extend(_top_values_lines(unique_count, top_values, non_null_count))
+
         return "\n".join(summary)
-        
+    return finish
+
+@mcp.tool()
+async def summarize_fields(service_url: str, field_names: list[str]) -> str:
+    """Provides summary statistics for several fields of an ArcGIS feature layer in one call.
+
+    Args:
+        service_url: The REST service URL of the feature layer (obtained from search_layers).
+        field_names: The names of the fields to summarize (obtained from get_feature_table).
+
+    Returns:
+        One summary per field, in the same format as summarize_field, separated by blank lines.
+
+    Workflow:
+        Prefer this over calling summarize_field once per field: the count, min, max, mean and
+        std dev of every field are fetched from the server in a single statistics query.
+    """
+    try:
+        return await _run_sync(_summarize_fields, service_url, tuple(field_names))
     except Exception as e:
-        return f"Error summarizing field: {e}"
+        return f"Error summarizing fields: {e}"
+
+def _summarize_fields(service_url: str, field_names) -> str:
+    """Summarizes several fields of one layer, issuing their server queries together.
+
+    The statistics of every field share one outStatistics request (see _batched_stats). The
+    grouped queries behind top values are still one set per field, but all of them are
+    submitted before any is awaited, so they overlap just as separate summarize_field calls
+    would. Fields the server can't summarize fall back to a client-side scan, one at a time.
+    """
+    if not field_names:
+        return "No field names given."
+    flayer, fields_by_lower, _ = _layer_meta(service_url)
+    field_infos = [fields_by_lower.get(name.lower()) for name in field_names]
+    # Each field is summarized once, however often it was asked for
+    fields = {f.name: f for f in field_infos if f is not None}
+    on_server = [f for f in fields.values() if f.type not in _NON_TABULAR_TYPES] if _supports_statistics(flayer) else []
+
+    # One statistics request for every field, plus one count for the null percentages
+    batched, total_count = {}, None
+    if on_server:
+        try:
+            total_future = _executor.submit(flayer.query, where="1=1", return_count_only=True)
+            batched = {f.name: stats for f, stats in zip(on_server, _batched_stats(flayer, on_server))}
+            total_count = total_future.result()
+        except Exception:
+            batched = {}  # Batched query rejected; each field queries its own statistics below
+
+    pending = {f.name: _start_server_summary(flayer, f.name, f.type, batched.get(f.name), total_count)
+               for f in on_server}
+    results = {}
+    for name, field_info in fields.items():
+        if name in pending:
+            try:
+                results[name] = pending[name]()
+                continue
+            except Exception:
+                pass  # Statistics query rejected or incomplete; summarize client-side instead
+        results[name] = _summarize_by_scan(flayer, name, field_info.type)
+
+    return "\n\n".join(results[f.name] if f else f"Field '{name}' not found in the feature layer."
+                       for name, f in zip(field_names, field_infos))
 
 @mcp.tool()
-def search_content(keyword: str, item_type: str = None) -> str:
+async def search_content(keyword: str, item_type: str = None, limit: int = 20) -> str:
     """Searches ArcGIS Online for content items of any type and returns their Item IDs.
     
     Args:
         keyword: The keyword or description to search for (e.g., 'Traffic', 'Population').
         item_type: Optional filter for specific item type (e.g., 'Web Map', 'Dashboard', 'Feature Service').
+            If omitted, the common content types are searched in parallel and, when they return
+            fewer than limit items, topped up with items of any other type.
+        limit: Maximum number of items to return (default 20).
     
     Returns:
         A list of matching item titles with their Item IDs and types as a string.
@@ -216,25 +787,79 @@ def search_content(keyword: str, item_type: str = None) -> str:
         For feature layer data analysis, use search_layers instead.
     """
     try:
-        matches = []
-        
+        return await _run_sync(_search_content, keyword, item_type, limit)
+    except Exception as exc:
+        return f"Error searching content: {exc}"
+
+@_keyword_cache(_query_key)
+def _search_content(keyword: str, item_type: str = None, limit: int = 20) -> str:
+    matches = []
+
+    if item_type:
         # Search for content items
-        items = gis.content.search(
+        items = get_gis().content.search(
             query=keyword,
             item_type=item_type,
-            max_items=20
+            max_items=limit
         )
-        
-        for item in items:
-            title = item.title or "Untitled"
-            item_id = item.id
-            content_type = item.type or "Unknown"
-            matches.append(f"{title}: {item_id} | Type: {content_type}")
-        
-        return "\n".join(matches) if matches else "No matching content found."
-    except Exception as exc:
-        return f"Error searching content: {exc}"
+    else:
+        items = _search_common_types(keyword, limit)
+
+    for item in items:
+        title = item.title or "Untitled"
+        item_id = item.id
+        content_type = item.type or "Unknown"
+        matches.append(f"{title}: {item_id} | Type: {content_type}")
+
+    return "\n".join(matches) if matches else "No matching content found."
+
+def _search_common_types(keyword: str, limit: int):
+    """Searches each of _COMMON_CONTENT_TYPES concurrently and merges up to limit unique items.
+
+    Type-filtered searches hit a narrower slice of the portal index than an untyped search,
+    and running them in parallel keeps the latency close to a single query. Each type is asked
+    for an even share of limit and the results are interleaved round-robin, so one prolific
+    type can't crowd out the others. If that comes up short (sparse types, or matches of other
+    types such as Web Scenes or CSVs), an untyped search fills the remaining slots; it runs
+    alongside the typed ones so it never adds a round-trip.
+    """
+    share = -(-limit // len(_COMMON_CONTENT_TYPES))  # ceiling division
+    untyped = _executor.submit(lambda: get_gis().content.search(query=keyword, max_items=limit))
+    per_type = _executor.map(
+        lambda content_type: get_gis().content.search(query=keyword, item_type=content_type, max_items=share),
+        _COMMON_CONTENT_TYPES,
+    )
+    items, seen = [], set()
+
+    def add(candidates):
+        for item in candidates:
+            if len(items) == limit:
+                return
+            if item is not None and item.id not in seen:
+                seen.add(item.id)
+                items.append(item)
+
+    add(chain.from_iterable(zip_longest(*per_type)))
+    if len(items) < limit:
+        add(untyped.result())
+    else:
+        untyped.cancel()
+    return items
+
+@mcp.tool()
+async def clear_cache() -> str:
+    """Clears cached search results, feature tables and layer metadata.
 
+    Returns:
+        A confirmation message.
+
+    Workflow:
+        Use when a layer's data or schema has just changed and fresh results are needed
+        before the cache expires on its own.
+    """
+    for cached in (_search_layers, _service_layers, _get_feature_table, _search_content, _layer_meta):
+        cached.cache_clear()
+    return "Cache cleared."
 
 
 if __name__ == "__main__":
@@ -0,0 +1,51 @@
+import re
+from types import SimpleNamespace
+
+
+class StubLayer:
+    """Minimal FeatureLayer stand-in over in-memory rows, recording every query it receives."""
+
+    def __init__(self, oids, max_record_count=1000, pagination=False, statistics=False):
+        self.rows = [{"OBJECTID": oid} for oid in oids]
+        self.max_record_count = max_record_count
+        self.properties = {
+            "objectIdField": "OBJECTID",
+            "maxRecordCount": max_record_count,
+            "supportsStatistics": statistics,
+            "advancedQueryCapabilities": {"supportsPagination": pagination},
+        }
+        self.queries = []
+
+    def _matches(self, where):
+        window = re.fullmatch(r"\((.+)\) AND OBJECTID BETWEEN (\d+) AND (\d+)", where)
+        if window:
+            low, high = int(window[2]), int(window[3])
+            return [row for row in self._matches(window[1]) if low <= row["OBJECTID"] <= high]
+        mod = re.fullmatch(r"MOD\(OBJECTID, (\d+)\) = 0", where)
+        if mod:
+            return [row for row in self.rows if row["OBJECTID"] % int(mod[1]) == 0]
+        in_list = re.fullmatch(r"OBJECTID IN \(([\d,]+)\)", where)
+        if in_list:
+            wanted = {int(oid) for oid in in_list[1].split(",")}
+            return [row for row in self.rows if row["OBJECTID"] in wanted]
+        assert where == "1=1", where
+        return list(self.rows)
+
+    def query(self, where="1=1", out_statistics=None, result_offset=None, result_record_count=None,
+              return_count_only=False, **kwargs):
+        self.queries.append(where)
+        rows = self._matches(where)
+        if return_count_only:
+            return len(rows)
+        if out_statistics:
+            oids = [row["OBJECTID"] for row in rows]
+            attrs = {stat["outStatisticFieldName"]: (min if stat["statisticType"] == "min" else max)(oids, default=None)
+                     for stat in out_statistics}
+            return SimpleNamespace(features=[SimpleNamespace(attributes=attrs)])
+        rows = rows[result_offset or 0:]
+        rows = rows[:min(result_record_count or self.max_record_count, self.max_record_count)]
+        return SimpleNamespace(features=[SimpleNamespace(attributes=row) for row in rows])
+
+
+def oids_of(features):
+    return [feat.attributes["OBJECTID"] for feat in features]
@@ -0,0 +1,33 @@
+import pytest
+
+import main
+from conftest import StubLayer, oids_of
+
+
+@pytest.mark.parametrize("max_rows, expected_queries", [(None, 3), (20, 1), (2500, 3)])
+def test_pagination_pages_by_offset(max_rows, expected_queries):
+    layer = StubLayer(range(1, 2501), pagination=True)
+    features = oids_of(main._iter_features(layer, max_rows=max_rows))
+    assert features == list(range(1, 2501))[:max_rows]
+    assert len(layer.queries) == expected_queries
+
+
+def test_oid_ranges_without_pagination():
+    # Every third OBJECTID is missing, so windows come back partly empty
+    oids = [oid for oid in range(1, 5001) if oid % 3]
+    layer = StubLayer(oids, statistics=True)
+    assert oids_of(main._iter_features(layer)) == oids
+    # One min/max statistics query, then one query per 1000-OBJECTID window
+    assert len(layer.queries) == 1 + 5
+
+
+def test_oid_ranges_small_sample_is_one_window():
+    layer = StubLayer([oid for oid in range(1, 5001) if oid % 3], statistics=True)
+    assert len(oids_of(main._iter_features(layer, max_rows=20))) == 20
+    assert len(layer.queries) == 2
+
+
+def test_single_query_without_paging_support():
+    layer = StubLayer(range(1, 51))
+    assert oids_of(main._iter_features(layer, max_rows=20)) == list(range(1, 21))
+    assert layer.queries == ["1=1"]
@@ -0,0 +1,18 @@
+from types import SimpleNamespace
+
+import main
+
+
+def test_content_cache_keeps_operators_distinct(monkeypatch):
+    queries = []
+
+    def search(query, item_type=None, max_items=10):
+        queries.append(query)
+        return []
+
+    monkeypatch.setattr(main, "_gis", SimpleNamespace(content=SimpleNamespace(search=search)))
+    main._search_content.cache_clear()
+    for keyword in ("roads or highways", "Roads OR Highways", "roads OR highways"):
+        main._search_content(keyword, "Web Map", 5)
+    # Case-only differences share an entry; the boolean query is its own search
+    assert queries == ["roads or highways", "Roads OR Highways"]
@@ -0,0 +1,26 @@
+import pytest
+
+import main
+from conftest import StubLayer, oids_of
+
+
+@pytest.mark.parametrize("pagination, statistics", [(True, True), (False, True)])
+def test_spread_sample_costs_a_constant_number_of_queries(pagination, statistics):
+    layer = StubLayer(range(1, 200_001), pagination=pagination, statistics=statistics)
+    sample = oids_of(main._spread_features(layer, "*", 20))
+    assert len(sample) == 20
+    # Spread over the whole table rather than the first rows
+    assert sample[-1] > 190_000
+    # A count or min/max query, then a single page
+    assert len(layer.queries) == 2
+
+
+def test_spread_falls_back_to_first_rows_when_table_is_small():
+    layer = StubLayer(range(1, 31), statistics=True)
+    assert oids_of(main._spread_features(layer, "*", 20)) == list(range(1, 21))
+
+
+def test_spread_without_paging_support_reads_first_rows():
+    layer = StubLayer(range(1, 101))
+    assert oids_of(main._spread_features(layer, "*", 20)) == list(range(1, 21))
+    assert layer.queries == ["1=1"]